@@ -36,7 +36,7 @@ class AgentOrchestrator:
             # Actually, let's keep fetcher as "Legacy Pete" if we want, but user wants True Pete.
             # We will use SQLAgent as the primary data tool.
             self.sql_agent = SQLAgent(database)
-            self.visualization_agent = VisualizationAgent()
+            self.visualization_agent = VisualizationAgent(warm_fonts=True)
             self.summary_agent = SummaryAgent() # Fixed: No args in init
             
             logger.info("AgentOrchestrator initialized (agent mode enabled with visualization)")
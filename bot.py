@@ -26,11 +26,12 @@ def main():
         database = SQLJobDatabase(Config.DB_PATH)
         # database.load_all() # Not needed for SQL
         
-        if not database.get_all_jobs():
+        total_jobs = database.count_jobs()
+        if not total_jobs:
             logger.error("No job postings loaded! Please check XML files.")
             sys.exit(1)
         
-        logger.info(f"Successfully loaded {len(database.get_all_jobs())} job postings")
+        logger.info(f"Successfully loaded {total_jobs} job postings")
         logger.info(f"Years available: {', '.join(database.get_years())}")
         
         # Create and start bot
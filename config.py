@@ -22,6 +22,10 @@ class Config:
     # Agent Mode Configuration (default: enabled)
     USE_AGENT_MODE = os.getenv('USE_AGENT_MODE', 'true').lower() == 'true'
     AGENT_MODEL = os.getenv('AGENT_MODEL', 'openai/gpt-oss-120b')
+    TOLERATE_BAD_JSON = os.getenv('TOLERATE_BAD_JSON', 'false').lower() == 'true'  # Retry brace-less tool args
+    HISTORY_SUMMARY_MODEL = os.getenv('HISTORY_SUMMARY_MODEL', 'openai/gpt-4o-mini')  # Cheap model for compressing old turns
+    PLANNING_MAX_TOKENS = int(os.getenv('PLANNING_MAX_TOKENS', '256'))  # Output cap for tool-planning turns (includes reasoning tokens)
+    SUMMARY_MAX_TOKENS = int(os.getenv('SUMMARY_MAX_TOKENS', '1024'))  # Output cap for the final summary turn
     
     # Bot Settings
     BOT_PREFIX = '@'  # Mention-based, not needed but kept for reference
@@ -1,7 +1,7 @@
 import sqlite3
 import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -102,6 +102,20 @@ class SQLJobDatabase:
             jel_classification=row['jel_classification'] or ''
         )
 
+    def count_jobs(self) -> int:
+        """Return the total number of jobs without loading them."""
+        query = "SELECT COUNT(*) FROM jobs"
+        # Store query for debugging/user inspection
+        self.last_query = self._format_query_with_params(query, ())
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            return cursor.fetchone()[0]
+        finally:
+            conn.close()
+
     # Filtering methods using SQL
     def get_by_year(self, year: str) -> List[JobPosting]:
         return self.query_jobs("SELECT * FROM jobs WHERE year = ?", (year,))
@@ -115,22 +129,30 @@ class SQLJobDatabase:
     def get_by_state(self, state: str) -> List[JobPosting]:
         return self.query_jobs("SELECT * FROM jobs WHERE location LIKE ?", (f"%{state}%",))
 
-    # Metadata methods
+    # Metadata methods (the _fetch_* helpers take a cursor so queries can share a connection)
+    def _fetch_years(self, cursor) -> List[str]:
+        cursor.execute("SELECT DISTINCT year FROM jobs WHERE year IS NOT NULL ORDER BY year DESC")
+        return [str(row[0]) for row in cursor.fetchall()]
+
+    def _fetch_institutions(self, cursor) -> List[str]:
+        cursor.execute("SELECT DISTINCT institution FROM jobs WHERE institution IS NOT NULL ORDER BY institution")
+        return [row[0] for row in cursor.fetchall()]
+
+    def _fetch_countries(self, cursor) -> List[str]:
+        cursor.execute("SELECT DISTINCT location FROM jobs WHERE location IS NOT NULL")
+        return [row[0] for row in cursor.fetchall()]
+
     def get_years(self) -> List[str]:
         conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT year FROM jobs WHERE year IS NOT NULL ORDER BY year DESC")
-            return [str(row[0]) for row in cursor.fetchall()]
+            return self._fetch_years(conn.cursor())
         finally:
             conn.close()
 
     def get_institutions(self) -> List[str]:
         conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT institution FROM jobs WHERE institution IS NOT NULL ORDER BY institution")
-            return [row[0] for row in cursor.fetchall()]
+            return self._fetch_institutions(conn.cursor())
         finally:
             conn.close()
 
@@ -143,10 +165,39 @@ class SQLJobDatabase:
         # Since we don't have strict country column, we might return known locations or rely on raw strings
         # For now, simplistic approach
         conn = self.get_connection()
+        try:
+            return self._fetch_countries(conn.cursor())
+        finally:
+            conn.close()
+
+    def get_index_summary(self) -> Tuple[List[str], List[str], List[str]]:
+        """Return (years, institutions, countries) using a single connection."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            return self._fetch_years(cursor), self._fetch_institutions(cursor), self._fetch_countries(cursor)
+        finally:
+            conn.close()
+
+    def get_first_nonempty_institution(self) -> Optional[str]:
+        """Return the first institution (alphabetically) that has at least one job."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT institution FROM jobs WHERE institution IS NOT NULL GROUP BY institution ORDER BY institution LIMIT 1")
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def get_first_nonempty_country(self) -> Optional[str]:
+        """Return the first location that has at least one job."""
+        conn = self.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT location FROM jobs WHERE location IS NOT NULL")
-            return [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT location FROM jobs WHERE location IS NOT NULL GROUP BY location LIMIT 1")
+            row = cursor.fetchone()
+            return row[0] if row else None
         finally:
             conn.close()
 
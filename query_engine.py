@@ -7,11 +7,13 @@ SECURITY: Safe from prompt injection attacks.
 - Queries only filter existing in-memory data
 - Agent mode uses LLM for intelligent interpretation but all data access is read-only
 """
+import os
 import re
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from collections import Counter
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from database import SQLJobDatabase, JobPosting
 from config import Config
 
@@ -27,6 +29,15 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Queries asking for the last executed SQL (never cached)
+SQL_INSPECTION_WORDS = ('show sql', 'debug sql', 'last query', 'show query')
+
+# Max pattern-matching results memoized per engine
+RESULT_CACHE_SIZE = 256
+
+# Four-digit years 1900-2099
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+
 
 class QueryEngine:
     """Process natural language queries against the job database."""
@@ -40,6 +51,7 @@ class QueryEngine:
         """
         self.db = database
         self.agent_orchestrator = None
+        self._result_cache = OrderedDict()  # LRU: {(query, db mtime): (result, last SQL)}
         
         # Initialize Agent Orchestrator if enabled
         if Config.USE_AGENT_MODE and AGENT_MODE_AVAILABLE and Config.OPENROUTER_API_KEY:
@@ -53,13 +65,16 @@ class QueryEngine:
             logger.info("QueryEngine initialized (pattern matching only)")
     
     
-    def process_query(self, query: str, context_id: str = None) -> Dict[str, Any]:
+    def process_query(self, query: str, context_id: str = None,
+                      use_cache: bool = True) -> Dict[str, Any]:
         """
         Process a natural language query.
         
         Args:
             query: The question text
             context_id: Optional context identifier for history
+            use_cache: Memoize pattern-matching results (disable when other threads
+                may run queries concurrently, since cached entries record db.last_query)
             
         Returns:
             Dictionary with results or error
@@ -87,7 +102,9 @@ class QueryEngine:
             
             # Fallback to pattern matching (always works)
             logger.info("Processing with pattern matching")
-            return self._pattern_match_query(query_lower)
+            if not use_cache:
+                return self._pattern_match_query(query_lower)
+            return self._cached_pattern_match(query_lower)
         
         except Exception as e:
             logger.error(f"Error processing query: {e}")
@@ -96,10 +113,79 @@ class QueryEngine:
                 'message': f'Error processing query: {str(e)}'
             }
     
+    def process_queries(self, queries: List[str], context_id: str = None,
+                        max_workers: int = 1) -> List[Dict[str, Any]]:
+        """
+        Process several natural language queries in one call.
+        
+        Queries that normalize to the same text are only executed once.
+        
+        Args:
+            queries: The question texts
+            context_id: Optional context identifier for history
+            max_workers: Run up to this many unique queries concurrently
+                (each database call opens its own SQLite connection; the result
+                cache is bypassed because db.last_query is shared across threads)
+            
+        Returns:
+            List of result dictionaries, in the same order as queries
+        """
+        unique = {}
+        for query in queries:
+            unique.setdefault(query.lower().strip(), query)
+        
+        if max_workers > 1 and len(unique) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(
+                    lambda q: self.process_query(q, context_id=context_id, use_cache=False),
+                    unique.values())
+                results_by_query = dict(zip(unique, results))
+        else:
+            results_by_query = {key: self.process_query(query, context_id=context_id)
+                                for key, query in unique.items()}
+        
+        return [results_by_query[query.lower().strip()] for query in queries]
+    
+    def clear_cache(self):
+        """Drop memoized pattern-matching results (e.g. after mutating the database)."""
+        self._result_cache.clear()
+    
+    def _cached_pattern_match(self, query: str) -> Dict[str, Any]:
+        """
+        Pattern-match a query, memoizing results until the database file changes.
+        
+        Each entry also stores the SQL it ran (if any), so 'show sql' stays accurate on a cache hit.
+        """
+        if any(word in query for word in SQL_INSPECTION_WORDS):
+            return self._pattern_match_query(query)
+        
+        try:
+            db_mtime = os.path.getmtime(self.db.db_path)
+        except OSError:
+            return self._pattern_match_query(query)
+        
+        key = (query, db_mtime)
+        if key in self._result_cache:
+            self._result_cache.move_to_end(key)
+            result, sql = self._result_cache[key]
+            if sql is not None:
+                self.db.last_query = sql
+            return result
+        
+        previous_sql = self.db.last_query
+        result = self._pattern_match_query(query)
+        if result.get('type') != 'error':
+            # Only record SQL this query actually ran, not whatever an earlier one left behind
+            sql = self.db.last_query if self.db.last_query is not previous_sql else None
+            self._result_cache[key] = (result, sql)
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return result
+    
     def _pattern_match_query(self, query: str) -> Dict[str, Any]:
         """Original pattern matching logic (fallback)."""
         # Show SQL query (Check this first to avoid 'show' matching list queries)
-        if any(word in query for word in ['show sql', 'debug sql', 'last query', 'show query']):
+        if any(word in query for word in SQL_INSPECTION_WORDS):
             return self._handle_sql_query()
 
         # Count queries
@@ -126,7 +212,7 @@ class QueryEngine:
     def _handle_count_query(self, query: str) -> Dict[str, Any]:
         """Handle count/how many queries."""
         # Extract year
-        year_match = re.search(r'\b(19|20)\d{2}\b', query)
+        year_match = YEAR_RE.search(query)
         year = year_match.group(0) if year_match else None
         
         # Extract institution
@@ -200,7 +286,7 @@ class QueryEngine:
     def _handle_list_query(self, query: str) -> Dict[str, Any]:
         """Handle list/show queries."""
         # Similar filtering as count but return job details
-        year_match = re.search(r'\b(19|20)\d{2}\b', query)
+        year_match = YEAR_RE.search(query)
         year = year_match.group(0) if year_match else None
         
         institution = None
@@ -319,10 +405,8 @@ class QueryEngine:
     
     def _overall_stats(self) -> Dict[str, Any]:
         """Get overall database statistics."""
-        all_jobs = self.db.get_all_jobs()
-        
         stats = {
-            'Total Jobs': len(all_jobs),
+            'Total Jobs': self.db.count_jobs(),
             'Years': len(self.db.get_years()),
             'Institutions': len(self.db.get_institutions()),
             'Countries': len(self.db.get_countries())
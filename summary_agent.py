@@ -3,38 +3,167 @@
 This agent handles both the planning and interpretation phases using a single
 conversational context with tool calling to the Fetcher Agent.
 """
+import functools
+import hashlib
 import logging
 import json
-from typing import Dict, Any, Optional, List
+import re
+import sys
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Any, Optional, List, Tuple
+import httpx
+import orjson
 from openai import OpenAI
 from config import Config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Leaked tool call syntax: JSON array/object containing "name": and "parameters":
+_JSON_TOOL_CALL_RE = re.compile(r'^\s*\[\s*\{[^}]*"name"\s*:\s*"[^"]+"\s*,\s*"parameters"\s*:', re.DOTALL)
+_SINGLE_JSON_TOOL_CALL_RE = re.compile(r'^\s*\{[^}]*"name"\s*:\s*"(create_chart|ask_pete|get_last_sql)"', re.DOTALL)
+
+# LLM "thinking out loud" patterns at the start of a response
+_THINKING_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'^We need to query[^.]*\.?\s*Now call [^.]+\.\s*',  # "We need to query: ... Now call ask_pete(...)"
+    r'^We need to[^.]*\.\s*',  # "We need to ..."
+    r'^Now call [^.]+\.\s*',   # "Now call ask_pete(...)"
+    r'^Let me [^.]+\.\s*',     # "Let me query..."
+    r'^I will [^.]+\.\s*',     # "I will ask Pete..."
+)]
+
+# Common prefixes to strip ("summary:", "summary.", "response:", "answer:", "to answer:", "to answer.", "result:")
+_PREFIX_RE = re.compile(r'^(?:summary[:.]|response:|answer:|to answer[:.]|result:)\s*', re.IGNORECASE)
+
+# First characters of all the cleanup patterns above (JSON tool calls, thinking, prefixes)
+_TRIGGER_FIRST_CHARS = frozenset("[{wnlisrat")
+
+# System prompts for the tool-calling conversation, keyed by persona name
+_PERSONAS = {
+    "cawley": """You are John Cawley, a Professor of Economics at Cornell University.
+- **Tone**: Professional, academic, and factual.
+- **Style**: Disseminate results clearly and concisely. Avoid "fluff" or excessive enthusiasm.
+- **Formatting**: Do NOT bold numbers. Use standard punctuation.
+- **Goal**: Inform the user about the job market based on the data.
+
+You work with "Pete", an autonomous **SQL Agent** (your pre-doctoral research assistant).
+- **MANDATORY**: For any question requiring data (counts, jobs, locations, etc.), you MUST call `ask_pete`.
+- Please call `ask_pete` immediately when you identify a data question.
+- **MANDATORY**: If the user asks for a graph, chart, or plot, you MUST call `create_chart` after you have the data.
+- **CRITICAL**: Do NOT include the SQL query in your response unless the user explicitly asks.
+- If the user asks "What was the query?" or "Show SQL", THEN call `get_last_sql` and display it.
+- Pete adheres to high ethical standards (he never hallucinates data).
+
+Your capabilities:
+- Query the database by calling `ask_pete(question="...")`
+- Retrieve the code for the last query with `get_last_sql()`
+- Create visualizations (charts/graphs) using the `create_chart` tool
+- Provide insights, trends, and context about the job market
+
+IMPORTANT: 
+- When you create a chart, the system will handle displaying it. You do NOT need to print the file path.
+- Just describe the chart and what it shows in your summary.
+
+CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final response. Only provide the natural language summary.
+""",
+}
+
+_SIMPLE_SYSTEM_PROMPT = """You are a job market analyst. Interpret the provided job posting data and give a clear, concise summary."""
+
+# Keyword hints used to pick the first tool without an extra planning round
+_DATA_KEYWORDS = ("how many", "count", "list", "show")
+_CHART_KEYWORDS = ("chart", "graph", "plot")
+_SQL_KEYWORDS = ("sql", "query was", "the query")
+
+# Shared pool for running tool callbacks while the model is still streaming
+_TOOL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool")
+
+# Tools that read state left by earlier tools (get_last_sql reads the SQL ask_pete ran);
+# these wait for every earlier call in the turn, and later calls wait for them
+_STATE_READING_TOOLS = frozenset({"get_last_sql"})
+
+# Persisted history messages above this size are logged
+_MAX_HISTORY_MESSAGE_CHARS = 4096
+
+# Max process_simple answers memoized per agent
+_SIMPLE_CACHE_SIZE = 256
+
+# Max (query, data) pairs packed into one process_simple_many request
+_SIMPLE_BATCH_SIZE = 10
+
+
+@dataclass(slots=True, frozen=True)
+class Msg:
+    """A chat message in the tool-calling loop."""
+    role: str
+    content: Optional[str]
+    tool_call_id: Optional[str] = None
+    name: Optional[str] = None
+    tool_calls: Optional[List[Dict[str, Any]]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dict form the OpenAI API expects, omitting unset fields."""
+        message = {"role": self.role, "content": self.content}
+        if self.tool_call_id is not None:
+            message["tool_call_id"] = self.tool_call_id
+        if self.name is not None:
+            message["name"] = self.name
+        if self.tool_calls is not None:
+            message["tool_calls"] = self.tool_calls
+        return message
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client() -> OpenAI:
+    """Return the process-wide OpenRouter client so all agents share one connection pool."""
+    return OpenAI(
+        base_url="https://openrouter.ai/api/v1",
+        api_key=Config.OPENROUTER_API_KEY,
+        http_client=httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        ),
+    )
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string with orjson (the OpenAI SDK expects str content)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class SummaryAgent:
     """Unified agent for planning and interpretation using conversation with tools."""
     
-    def __init__(self, model: Optional[str] = None):
+    def __init__(self, model: Optional[str] = None, persona: str = "cawley",
+                 max_iterations: int = 10, cache_simple: bool = True):
         """
         Initialize the Summary Agent.
         
         Args:
             model: Model to use (defaults to Config.AGENT_MODEL)
+            persona: Key into _PERSONAS selecting the system prompt
+            max_iterations: Max tool-calling rounds per query (10 allows multi-step data + graph)
+            cache_simple: Memoize process_simple answers for identical (query, data) pairs
         """
+        if persona not in _PERSONAS:
+            raise ValueError(f"Unknown persona: {persona}")
+        
         self.model = model or Config.AGENT_MODEL
+        self.system_prompt = _PERSONAS[persona]
+        self.max_iterations = max_iterations
         self.client = None
         self.enabled = False
         self.conversations = {}  # Store conversation history: {id: [messages]}
-        self.max_history = 10    # Keep last 10 messages
+        self._compressions = {}  # History compression running after a reply: {id: Future}
+        self.max_history = 10    # Compress history once it exceeds 10 messages
+        self.cache_simple = cache_simple
+        self._simple_cache = OrderedDict()  # LRU: {(model, query, data digest): summary}
         
         if Config.OPENROUTER_API_KEY:
             try:
-                self.client = OpenAI(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=Config.OPENROUTER_API_KEY,
-                )
+                self.client = _get_client()
                 self.enabled = True
                 logger.info(f"SummaryAgent initialized with model: {self.model}")
             except Exception as e:
@@ -64,152 +193,134 @@ class SummaryAgent:
         generated_charts = []
         
         try:
-            # Enhanced system prompt with visualization capabilities
-            # Enhanced system prompt with personality
-            # Enhanced system prompt with visualization capabilities
-            # Enhanced system prompt with personality
-            system_prompt = """You are John Cawley, a Professor of Economics at Cornell University.
-- **Tone**: Professional, academic, and factual.
-- **Style**: Disseminate results clearly and concisely. Avoid "fluff" or excessive enthusiasm.
-- **Formatting**: Do NOT bold numbers. Use standard punctuation.
-- **Goal**: Inform the user about the job market based on the data.
-
-You work with "Pete", an autonomous **SQL Agent** (your pre-doctoral research assistant).
-- **MANDATORY**: For any question requiring data (counts, jobs, locations, etc.), you MUST call `ask_pete`.
-- Please call `ask_pete` immediately when you identify a data question.
-- **MANDATORY**: If the user asks for a graph, chart, or plot, you MUST call `create_chart` after you have the data.
-- **CRITICAL**: Do NOT include the SQL query in your response unless the user explicitly asks.
-- If the user asks "What was the query?" or "Show SQL", THEN call `get_last_sql` and display it.
-- Pete adheres to high ethical standards (he never hallucinates data).
-
-Your capabilities:
-- Query the database by calling `ask_pete(question="...")`
-- Retrieve the code for the last query with `get_last_sql()`
-- Create visualizations (charts/graphs) using the `create_chart` tool
-- Provide insights, trends, and context about the job market
-
-IMPORTANT: 
-- When you create a chart, the system will handle displaying it. You do NOT need to print the file path.
-- Just describe the chart and what it shows in your summary.
-
-CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final response. Only provide the natural language summary.
-"""
-
             # Build conversation
-            messages = [{"role": "system", "content": system_prompt}]
+            messages = [Msg(role="system", content=self.system_prompt)]
             
-            # Load history if exists
+            # Load history if exists (after any compression still running from the last turn)
+            pending = self._compressions.pop(conversation_id, None) if conversation_id else None
+            if pending is not None:
+                wait([pending])
             if conversation_id and conversation_id in self.conversations:
                 # Add previous context
                 history = self.conversations[conversation_id]
-                messages.extend(history)
+                messages.extend(Msg(**m) for m in history)
                 logger.info(f"Loaded {len(history)} messages from history for {conversation_id}")
             
             # Add current user query
-            messages.append({"role": "user", "content": user_query})
+            messages.append(Msg(role="user", content=user_query))
             
             logger.info(f"Processing query with SummaryAgent: {user_query}")
             
             # First call to kick off the loop
             # Max iterations to prevent infinite loops
-            # Increased to 10 for complex queries (e.g. multi-step data + graph)
-            max_iterations = 10
             iteration = 0
+            previous_had_tools = False
             
-            while iteration < max_iterations:
+            while iteration < self.max_iterations:
                 iteration += 1
                 
-                # On first iteration, force any tool use to prevent model "stage fright"
+                # On first iteration, force tool use to prevent model "stage fright",
+                # naming the likely tool when the query makes it obvious
                 # After that, allow auto for flexibility (e.g., to respond with text)
                 if iteration == 1:
-                    current_tool_choice = "required"  # Force ANY tool call
+                    initial_tool = self._guess_initial_tool(user_query, tools)
+                    if initial_tool:
+                        current_tool_choice = {"type": "function", "function": {"name": initial_tool}}
+                    else:
+                        current_tool_choice = "required"  # Force ANY tool call
                 else:
                     current_tool_choice = "auto"
                 
                 logger.info(f"Iteration {iteration}: tool_choice={current_tool_choice}, tools_count={len(tools) if tools else 0}")
-                if tools:
-                    tool_names = [t['function']['name'] for t in tools if 'function' in t]
-                    logger.info(f"Available tools: {tool_names}")
+                if tools and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Available tools: %s", [t['function']['name'] for t in tools if 'function' in t])
                 
-                try:
-                    response = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=messages,
-                        tools=tools,
-                        tool_choice=current_tool_choice,
-                        temperature=0.3
-                    )
-                except Exception as api_error:
-                    logger.error(f"API call failed: {api_error}")
-                    return {
-                        "content": f"Error calling AI model: {str(api_error)}",
-                        "charts": []
-                    }
+                # Planning turns only emit tool calls; a turn after tool results is likely the summary
+                max_tokens = Config.SUMMARY_MAX_TOKENS if previous_had_tools else Config.PLANNING_MAX_TOKENS
                 
-                assistant_message = response.choices[0].message
+                while True:
+                    try:
+                        stream = self.client.chat.completions.create(
+                            model=self.model,
+                            messages=[m.to_dict() for m in messages],
+                            tools=tools,
+                            tool_choice=current_tool_choice,
+                            temperature=0.3,
+                            max_tokens=max_tokens,
+                            stream=True
+                        )
+                        # Tool calls are dispatched as soon as their arguments are complete,
+                        # overlapping tool execution with the rest of the model's output
+                        content, tool_calls, finish_reason = self._consume_stream(stream, tool_callbacks)
+                    except Exception as api_error:
+                        logger.error(f"API call failed: {api_error}")
+                        return {
+                            "content": f"Error calling AI model: {str(api_error)}",
+                            "charts": []
+                        }
+                    
+                    # A planning turn cut off by its cap (reasoning tokens count too) before any
+                    # tool call completed is retried with the summary budget. Calls that did
+                    # complete have already run, so the turn proceeds with those instead of
+                    # running them twice (truncated calls were dropped by _consume_stream)
+                    if (finish_reason == "length" and not tool_calls
+                            and max_tokens < Config.SUMMARY_MAX_TOKENS):
+                        logger.warning(f"Iteration {iteration} hit the {max_tokens}-token cap, "
+                                       f"retrying with {Config.SUMMARY_MAX_TOKENS}")
+                        max_tokens = Config.SUMMARY_MAX_TOKENS
+                        continue
+                    break
+                
+                assistant_message = Msg(
+                    role="assistant",
+                    content=content,
+                    tool_calls=[
+                        {
+                            "id": call["id"],
+                            "type": "function",
+                            "function": {"name": call["name"], "arguments": call["arguments"]}
+                        }
+                        for call in tool_calls
+                    ] or None
+                )
                 messages.append(assistant_message)
+                previous_had_tools = bool(tool_calls)
                 
                 # Log raw message for debugging
-                logger.info(f"Raw Assistant Message: Content='{assistant_message.content}', ToolCalls={assistant_message.tool_calls}")
+                logger.debug("Raw assistant: %s / tools: %s", content, assistant_message.tool_calls)
 
                 # Check if agent called tools
-                if assistant_message.tool_calls:
-                    # Execute tool call(s)
-                    for tool_call in assistant_message.tool_calls:
-                        function_name = tool_call.function.name
-                        # Handle potential None arguments
-                        args_content = tool_call.function.arguments or "{}"
-                        try:
-                            function_args = json.loads(args_content)
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"JSON Decode Error: {e}. Content: {args_content}")
-                            # Attempt partial recovery if extra data exists
-                            try:
-                                function_args, _ = json.JSONDecoder().raw_decode(args_content)
-                            except:
-                                # Attempt adding missing braces (common LLM error)
-                                try:
-                                    function_args = json.loads("{" + args_content + "}")
-                                    logger.info("Fixed malformed JSON by adding braces")
-                                except:
-                                    function_args = {}
-                                    logger.error("Failed to recover JSON arguments")
-                        
-                        logger.info(f"Agent calling tool: {function_name} with args: {function_args}")
+                if tool_calls:
+                    # Wait for all dispatched tool calls, appending results in call order
+                    for call in tool_calls:
+                        tool_result = call["future"].result()
                         
-                        # Execute the appropriate callback
-                        if function_name in tool_callbacks:
-                            tool_result = tool_callbacks[function_name](**function_args)
-                            
-                            # Capture chart path if present
-                            if isinstance(tool_result, dict) and tool_result.get('chart_path'):
-                                generated_charts.append(tool_result['chart_path'])
-                                
-                        else:
-                            tool_result = {"error": f"Unknown tool: {function_name}"}
+                        # Capture chart path if present
+                        if isinstance(tool_result, dict) and tool_result.get('chart_path'):
+                            generated_charts.append(tool_result['chart_path'])
                         
                         # Add tool result to conversation
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": function_name,
-                            "content": json.dumps(tool_result)
-                        })
+                        messages.append(Msg(
+                            role="tool",
+                            content=_dumps(tool_result),
+                            tool_call_id=call["id"],
+                            name=call["name"]
+                        ))
                     
                     # Loop continues to let agent react to tool results
                 
                 else:
                     # No tool calls - this is the final response
-                    summary = assistant_message.content
+                    summary = content
                     if not summary:
                         # Fallback: Check if we just executed a tool and got no commentary
-                        # messages[-1] is assistant_message (object), messages[-2] is tool result (dict)
+                        # messages[-1] is assistant_message, messages[-2] is tool result
                         # We need to make sure we access messages[-2] safely
                         if len(messages) >= 2:
                             last_msg = messages[-2]
-                            if isinstance(last_msg, dict) and last_msg.get('role') == 'tool':
+                            if last_msg.role == 'tool':
                                 # Show the raw tool output (truncated to prevent overflow if massive)
-                                raw_output = last_msg.get('content', '')
+                                raw_output = last_msg.content or ''
                                 
                                 # Smart formatting: Parse and summarize data
                                 try:
@@ -229,14 +340,14 @@ CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final respo
                                                 val = list(rows[0].values())[0]
                                                 summary = f"The result is: {val}"
                                             else:
-                                                # Multiple rows - format as table-like
-                                                lines = [f"Found {row_count} result(s):"]
-                                                for i, row in enumerate(rows[:10]):  # Limit to 10
-                                                    row_str = ", ".join(f"{k}: {v}" for k, v in row.items())
-                                                    lines.append(f"• {row_str}")
+                                                # Multiple rows - format as table-like (limit to 10)
+                                                body = "\n".join(
+                                                    "• " + ", ".join(f"{k}: {v}" for k, v in row.items())
+                                                    for row in islice(rows, 10)
+                                                )
+                                                summary = f"Found {row_count} result(s):\n{body}"
                                                 if row_count > 10:
-                                                    lines.append(f"... and {row_count - 10} more")
-                                                summary = "\n".join(lines)
+                                                    summary += f"\n... and {row_count - 10} more"
                                         elif 'sql' in data:
                                             summary = f"Query executed successfully."
                                         else:
@@ -245,7 +356,7 @@ CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final respo
                                     summary = f"Action completed. Raw result: {raw_output[:2000]}"
                                     if len(raw_output) > 2000: summary += "..."
                             else:
-                                summary = f"I processed the query but have no response. (Debug: Tool Result Invalid, Role={last_msg.get('role') if isinstance(last_msg, dict) else type(last_msg).__name__})"
+                                summary = f"I processed the query but have no response. (Debug: Tool Result Invalid, Role={last_msg.role})"
                         else:
                             summary = f"I processed the query but have no response. (Debug: No Tool Calls, History={len(messages)})"
                     logger.info(f"Agent generated summary with {len(generated_charts)} charts")
@@ -260,12 +371,13 @@ CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final respo
                             self.conversations[conversation_id] = []
                         
                         # Add User query and Assistant response (simplified)
-                        self.conversations[conversation_id].append({"role": "user", "content": user_query})
-                        self.conversations[conversation_id].append({"role": "assistant", "content": summary})
+                        self._append_history(conversation_id, {"role": "user", "content": user_query})
+                        self._append_history(conversation_id, {"role": "assistant", "content": summary})
                         
-                        # Prune history
+                        # Compress history after replying rather than making the user wait on it
                         if len(self.conversations[conversation_id]) > self.max_history:
-                            self.conversations[conversation_id] = self.conversations[conversation_id][-self.max_history:]
+                            self._compressions[conversation_id] = _TOOL_POOL.submit(
+                                self._compact_history, conversation_id)
                     
                     return {
                         "content": summary,
@@ -285,58 +397,267 @@ CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final respo
                 "charts": []
             }
 
+    def _guess_initial_tool(self, user_query: str, tools: List[Dict[str, Any]]) -> Optional[str]:
+        """Guess the first tool to call from cheap keyword matching, or None if unclear."""
+        query = user_query.lower()
+        if any(word in query for word in _SQL_KEYWORDS):
+            return None  # Likely asking for the last query, let the model pick
+        
+        tool_names = {t['function']['name'] for t in tools or [] if 'function' in t}
+        # Charts need data first, so a chart request still starts with ask_pete
+        if "ask_pete" in tool_names and any(word in query for word in _DATA_KEYWORDS + _CHART_KEYWORDS):
+            return "ask_pete"
+        return None
+
+    def _consume_stream(self, stream, tool_callbacks: Dict[str, callable]
+                        ) -> Tuple[Optional[str], List[Dict[str, Any]], Optional[str]]:
+        """
+        Accumulate a streamed assistant message, dispatching tool calls early.
+        
+        Args:
+            stream: Streaming chat completion response
+            tool_callbacks: Dictionary mapping tool names to callable functions
+        
+        Returns:
+            Tuple of (message content, tool calls ordered by index, finish reason).
+            Each tool call dict holds 'id', 'name', 'arguments' and a 'future' for
+            its result. If the stream was cut off at max_tokens, calls whose
+            arguments never completed are dropped instead of run with empty arguments.
+        """
+        content_parts = []
+        finish_reason = None
+        # Names are rebuilt from fragments, so they are interned to share one object
+        # with the tool_callbacks keys across the assistant and tool messages
+        calls = {}  # {index: {"id", "name", "arguments", "future"}}
+        # Futures dispatched so far, in call order, for ordering state-reading tools
+        dispatched = []  # [(name, future)]
+        
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            delta = choice.delta
+            
+            if delta.content:
+                content_parts.append(delta.content)
+            
+            for tc in delta.tool_calls or []:
+                call = calls.setdefault(tc.index, {"id": None, "name": "", "arguments": "", "future": None})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function:
+                    call["name"] += tc.function.name or ""
+                    call["arguments"] += tc.function.arguments or ""
+                
+                # Dispatch once the arguments form a complete JSON object and every
+                # earlier call has been dispatched (so its dependencies are known)
+                if (call["future"] is None and call["name"] and call["arguments"].rstrip().endswith("}")
+                        and all(calls[i]["future"] is not None for i in calls if i < tc.index)):
+                    try:
+                        function_args = orjson.loads(call["arguments"])
+                    except orjson.JSONDecodeError:
+                        continue
+                    call["name"] = sys.intern(call["name"])
+                    call["future"] = self._submit_tool(call["name"], function_args, tool_callbacks,
+                                                       after=self._tool_dependencies(call["name"], dispatched))
+                    dispatched.append((call["name"], call["future"]))
+        
+        if finish_reason == "length":
+            # Truncated arguments are not worth recovering; keep only dispatched calls
+            truncated = [i for i in calls if calls[i]["future"] is None]
+            if truncated:
+                logger.warning(f"Dropping {len(truncated)} tool call(s) cut off at max_tokens")
+                for i in truncated:
+                    del calls[i]
+        
+        # Dispatch anything whose arguments never parsed cleanly mid-stream
+        # A lone tool call gains nothing from the pool, so it runs on this thread
+        inline = len(calls) == 1
+        for i in sorted(calls):
+            call = calls[i]
+            if call["future"] is None:
+                call["name"] = sys.intern(call["name"])
+                function_args = self._parse_tool_args(call["arguments"] or "{}")
+                call["future"] = self._submit_tool(call["name"], function_args, tool_callbacks, inline=inline,
+                                                   after=self._tool_dependencies(call["name"], dispatched))
+                dispatched.append((call["name"], call["future"]))
+        
+        content = "".join(content_parts) or None
+        return content, [calls[i] for i in sorted(calls)], finish_reason
+
+    def _parse_tool_args(self, args_content: str) -> Dict[str, Any]:
+        """Parse tool call arguments, recovering from trailing extra data."""
+        try:
+            return orjson.loads(args_content)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"JSON Decode Error: {e}. Content: {args_content}")
+        
+        # Attempt partial recovery if extra data exists
+        try:
+            function_args, _ = json.JSONDecoder().raw_decode(args_content)
+            return function_args
+        except json.JSONDecodeError:
+            pass
+        
+        # Attempt adding missing braces (older models sometimes drop them)
+        if Config.TOLERATE_BAD_JSON:
+            try:
+                function_args = orjson.loads("{" + args_content + "}")
+                logger.info("Fixed malformed JSON by adding braces")
+                return function_args
+            except orjson.JSONDecodeError:
+                pass
+        
+        logger.error("Failed to recover JSON arguments")
+        return {}
+
+    def _tool_dependencies(self, function_name: str, dispatched: List[Tuple[str, Future]]) -> List[Future]:
+        """
+        Return the earlier calls a tool call must wait for.
+        
+        A state-reading tool waits for every earlier call; any other tool waits only
+        for earlier state-reading calls, so independent calls run in parallel.
+        """
+        if function_name in _STATE_READING_TOOLS:
+            return [future for _, future in dispatched]
+        return [future for name, future in dispatched if name in _STATE_READING_TOOLS]
+
+    def _submit_tool(self, function_name: str, function_args: Dict[str, Any],
+                     tool_callbacks: Dict[str, callable], inline: bool = False,
+                     after: Optional[List[Future]] = None) -> Future:
+        """
+        Run a tool callback on the shared tool pool (or inline) and return its future.
+        
+        Args:
+            function_name: Tool to call
+            function_args: Keyword arguments for the tool
+            tool_callbacks: Dictionary mapping tool names to callable functions
+            inline: Run on the calling thread instead of the pool
+            after: Futures of earlier tool calls that must finish first
+        
+        Returns:
+            Future holding the tool result
+        """
+        logger.info(f"Agent calling tool: {function_name} with args: {function_args}")
+        
+        callback = tool_callbacks.get(function_name)
+        
+        def run():
+            if after:
+                wait(after)
+            if callback is None:
+                return {"error": f"Unknown tool: {function_name}"}
+            return callback(**function_args)
+        
+        if not inline:
+            return _TOOL_POOL.submit(run)
+        
+        future = Future()
+        try:
+            future.set_result(run())
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _append_history(self, conversation_id: str, message: Dict[str, Any]):
+        """Persist a message to conversation history, logging unusually large ones."""
+        size = len(message.get("content") or "")
+        if size > _MAX_HISTORY_MESSAGE_CHARS:
+            logger.warning(f"Persisting large {message.get('role')} message ({size} chars) for {conversation_id}")
+        
+        self.conversations[conversation_id].append(message)
+
+    def _compact_history(self, conversation_id: str):
+        """
+        Summarize the oldest half of a conversation, keeping recent turns verbatim.
+        
+        A summary from an earlier compression is folded into the new one, and the
+        cut is counted over the verbatim messages so user/assistant pairs stay together.
+        
+        Args:
+            conversation_id: Conversation whose history exceeded max_history
+        """
+        history = self.conversations[conversation_id]
+        start = 1 if history and history[0].get("role") == "system" else 0
+        
+        keep_old = self.max_history // 2
+        keep_old -= keep_old % 2
+        cut = start + keep_old
+        
+        old_msgs, recent = history[:cut], history[cut:]
+        summary_msg = self._compress_history(old_msgs)
+        if summary_msg:
+            self.conversations[conversation_id] = [summary_msg] + recent
+        else:
+            # Verbatim messages always come in pairs, so an even tail drops whole turns
+            self.conversations[conversation_id] = history[-(self.max_history - self.max_history % 2):]
+    
+    def _compress_history(self, old_msgs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Compress older conversation turns into a single summary message.
+        
+        Args:
+            old_msgs: Oldest history messages to fold into the summary
+        
+        Returns:
+            System message holding the summary, or None if summarization failed
+        """
+        transcript = "\n".join(f"{m.get('role', 'unknown')}: {m.get('content') or ''}" for m in old_msgs)
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=Config.HISTORY_SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": "Summarize these conversation turns in a few sentences. "
+                                                  "Keep any numbers, filters (years, institutions, locations) and "
+                                                  "open questions the user may refer back to. Omit pleasantries."},
+                    {"role": "user", "content": transcript}
+                ],
+                temperature=0.1,
+                max_tokens=300
+            )
+            summary = (response.choices[0].message.content or "").strip()
+        except Exception as e:
+            logger.warning(f"History compression failed, falling back to truncation: {e}")
+            return None
+        
+        if not summary:
+            return None
+        
+        logger.info(f"Compressed {len(old_msgs)} history messages into summary")
+        return {"role": "system", "content": f"Prior context summary: {summary}"}
+
     def _clean_response_text(self, text: str) -> str:
         """Remove common artifacts from LLM response."""
-        import re
-        
         if not text:
             return ""
             
         cleaned = text.strip()
         
+        # Fast path: every pattern below starts with one of these characters
+        if not cleaned or cleaned[0].lower() not in _TRIGGER_FIRST_CHARS:
+            return cleaned
+        
         # Detect and remove raw JSON tool call syntax that leaked into content
         # This happens when model outputs tool calls as text instead of using tool_calls
-        # Pattern: JSON array/object containing "name": and "parameters":
-        json_tool_call_pattern = r'^\s*\[\s*\{[^}]*"name"\s*:\s*"[^"]+"\s*,\s*"parameters"\s*:'
-        if re.search(json_tool_call_pattern, cleaned, re.DOTALL):
+        if _JSON_TOOL_CALL_RE.search(cleaned):
             # The entire response is leaked JSON tool calls - return fallback
             logger.warning("Detected leaked JSON tool call syntax in response, using fallback")
             return "I've processed your request. The visualization has been created."
         
         # Also check for single object tool call format
-        single_json_pattern = r'^\s*\{[^}]*"name"\s*:\s*"(create_chart|ask_pete|get_last_sql)"'
-        if re.search(single_json_pattern, cleaned, re.DOTALL):
+        if _SINGLE_JSON_TOOL_CALL_RE.search(cleaned):
             logger.warning("Detected leaked single JSON tool call in response, using fallback")
             return "I've processed your request."
         
         # Remove LLM "thinking out loud" patterns at the start
-        # Pattern: "We need to query: ..." or "Now call ask_pete..." followed by actual content
-        thinking_patterns = [
-            r'^We need to query[^.]*\.?\s*Now call [^.]+\.\s*',  # "We need to query: ... Now call ask_pete(...)"
-            r'^We need to[^.]*\.\s*',  # "We need to ..."
-            r'^Now call [^.]+\.\s*',   # "Now call ask_pete(...)"
-            r'^Let me [^.]+\.\s*',     # "Let me query..."
-            r'^I will [^.]+\.\s*',     # "I will ask Pete..."
-        ]
-        
-        for pattern in thinking_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-        
-        # Common prefixes to strip
-        prefixes = [
-            "summary:", "summary.", "response:", "answer:", 
-            "to answer:", "to answer.", "result:"
-        ]
-        
-        # Check for prefixes case-insensitively
-        lower_text = cleaned.lower()
-        for prefix in prefixes:
-            if lower_text.startswith(prefix):
-                # Remove prefix and leading whitespace
-                cleaned = cleaned[len(prefix):].strip()
-                break # Only remove one prefix
-                
-        return cleaned
+        for rx in _THINKING_RES:
+            cleaned = rx.sub('', cleaned)
+        
+        # Remove one common prefix (case-insensitive) and leading whitespace
+        return _PREFIX_RE.sub('', cleaned, count=1)
     
     def process_simple(self, user_query: str, result_data: Dict[str, Any]) -> str:
         """
@@ -354,11 +675,19 @@ CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final respo
             return "Agent mode is disabled."
         
         try:
-            system_prompt = """You are a job market analyst. Interpret the provided job posting data and give a clear, concise summary."""
+            cache_key = None
+            if self.cache_simple:
+                digest = hashlib.blake2b(
+                    orjson.dumps(result_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+                ).hexdigest()
+                cache_key = (self.model, user_query, digest)
+                if cache_key in self._simple_cache:
+                    self._simple_cache.move_to_end(cache_key)
+                    return self._simple_cache[cache_key]
             
             messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Query: {user_query}\n\nData: {json.dumps(result_data)}"}
+                {"role": "system", "content": _SIMPLE_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Query: {user_query}\n\nData: {_dumps(result_data)}"}
             ]
             
             response = self.client.chat.completions.create(
@@ -368,8 +697,69 @@ CRITICAL: Do NOT output raw tool calls, JSON, or code blocks in your final respo
                 max_tokens=500
             )
             
-            return response.choices[0].message.content
+            summary = response.choices[0].message.content
+            if cache_key is not None and summary:
+                self._simple_cache[cache_key] = summary
+                if len(self._simple_cache) > _SIMPLE_CACHE_SIZE:
+                    self._simple_cache.popitem(last=False)
+            return summary
         
         except Exception as e:
             logger.error(f"Error in simple interpretation: {e}")
             return f"Error interpreting results: {str(e)}"
+
+    def process_simple_many(self, pairs: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Interpret several pre-fetched results, packing up to 10 per request.
+        
+        The model is asked to answer all numbered queries in one JSON object,
+        so the system prompt and request overhead are paid once per batch.
+        
+        Args:
+            pairs: List of (user_query, result_data) tuples
+        
+        Returns:
+            One natural language summary per pair, in input order
+        """
+        if not self.enabled:
+            return ["Agent mode is disabled."] * len(pairs)
+        
+        summaries = []
+        for start in range(0, len(pairs), _SIMPLE_BATCH_SIZE):
+            batch = pairs[start:start + _SIMPLE_BATCH_SIZE]
+            if len(batch) == 1:
+                summaries.append(self.process_simple(*batch[0]))
+            else:
+                summaries.extend(self._process_simple_batch(batch))
+        return summaries
+
+    def _process_simple_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Interpret a batch of results in one call, falling back to per-item calls on a bad response."""
+        numbered = "\n\n".join(
+            f"[{i}] Query: {query}\nData: {_dumps(data)}" for i, (query, data) in enumerate(batch, 1)
+        )
+        instructions = (
+            f"Answer each of the {len(batch)} numbered queries independently. "
+            'Respond with a JSON object of the form {"answers": ["<summary for 1>", "<summary for 2>", ...]} '
+            "with exactly one summary per query, in order."
+        )
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": f"{_SIMPLE_SYSTEM_PROMPT}\n\n{instructions}"},
+                    {"role": "user", "content": numbered}
+                ],
+                temperature=0.5,
+                max_tokens=500 * len(batch),
+                response_format={"type": "json_object"}
+            )
+            answers = orjson.loads(response.choices[0].message.content or "{}").get("answers")
+            if isinstance(answers, list) and len(answers) == len(batch):
+                return [str(a) for a in answers]
+            logger.warning("Batched interpretation returned wrong number of answers, retrying individually")
+        except Exception as e:
+            logger.warning(f"Batched interpretation failed, retrying individually: {e}")
+        
+        return [self.process_simple(query, data) for query, data in batch]
@@ -3,11 +3,24 @@
 Test the bot's query processing without needing Discord.
 """
 import sys
+from itertools import islice
 from pathlib import Path
 from database import SQLJobDatabase
 from query_engine import QueryEngine
 from config import Config
 
+# Structured dumps for unrecognized result types (orjson if available)
+try:
+    import orjson
+
+    def _dump(result):
+        return orjson.dumps(result, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    import json
+
+    def _dump(result):
+        return json.dumps(result, indent=2, default=str)
+
 def print_header():
     """Print a nice header."""
     print("\n" + "="*70)
@@ -16,61 +29,68 @@ def print_header():
 
 def print_result(result):
     """Print query results in a readable format."""
-    result_type = result.get('type', 'unknown')
-    
-    print("\n" + "-"*70)
-    
-    if result_type == 'count':
-        print(f"COUNT RESULT")
-        print(f"Message: {result.get('message', 'N/A')}")
-        print(f"Count: {result.get('count', 0)}")
-        
-        filters = result.get('filters', {})
-        if any(filters.values()):
-            print("\nFilters Applied:")
-            for key, value in filters.items():
-                if value:
-                    print(f"  - {key}: {value}")
-    
-    elif result_type == 'list':
-        print(f"LIST RESULT")
-        results = result.get('results', [])
-        total = result.get('total_count', len(results))
-        print(f"Message: {result.get('message', 'N/A')}")
-        print(f"Showing {len(results)} of {total} results:\n")
-        
-        for i, item in enumerate(results[:10], 1):
-            print(f"{i}. {item['name']}")
-            print(f"   {item['value']}")
-            print()
-        
-        if total > len(results):
-            print(f"... and {total - len(results)} more")
-    
-    elif result_type == 'stats':
-        print(f"STATISTICS RESULT")
-        print(f"Message: {result.get('message', 'N/A')}\n")
+    # Collect lines and write them in one call instead of one print per line
+    out = []
+    get = result.get
+    try:
+        result_type = get('type', 'unknown')
         
-        stats = result.get('stats', {})
-        for key, value in list(stats.items())[:15]:
-            print(f"  {key}: {value}")
+        out.append("\n" + "-"*70)
         
-        if len(stats) > 15:
-            print(f"  ... and {len(stats) - 15} more")
-    
-    elif result_type == 'help':
-        print(f"HELP")
-        print(result.get('message', 'No help available'))
-    
-    elif result_type == 'error':
-        print(f"ERROR")
-        print(result.get('message', 'Unknown error'))
-    
-    else:
-        print(f"RESULT (type: {result_type})")
-        print(result)
-    
-    print("-"*70)
+        if result_type == 'count':
+            out.append(f"COUNT RESULT")
+            out.append(f"Message: {get('message', 'N/A')}")
+            out.append(f"Count: {get('count', 0)}")
+        
+            filters = get('filters', {})
+            if any(filters.values()):
+                out.append("\nFilters Applied:")
+                for key, value in filters.items():
+                    if value:
+                        out.append(f"  - {key}: {value}")
+        
+        elif result_type == 'list':
+            out.append(f"LIST RESULT")
+            results = get('results', [])
+            total = get('total_count', len(results))
+            out.append(f"Message: {get('message', 'N/A')}")
+            out.append(f"Showing {len(results)} of {total} results:\n")
+        
+            for i, item in enumerate(results[:10], 1):
+                out.append(f"{i}. {item['name']}")
+                out.append(f"   {item['value']}")
+                out.append("")
+        
+            if total > len(results):
+                out.append(f"... and {total - len(results)} more")
+        
+        elif result_type == 'stats':
+            out.append(f"STATISTICS RESULT")
+            out.append(f"Message: {get('message', 'N/A')}\n")
+        
+            stats = get('stats', {})
+            for key, value in islice(stats.items(), 15):
+                out.append(f"  {key}: {value}")
+        
+            if len(stats) > 15:
+                out.append(f"  ... and {len(stats) - 15} more")
+        
+        elif result_type == 'help':
+            out.append(f"HELP")
+            out.append(get('message', 'No help available'))
+        
+        elif result_type == 'error':
+            out.append(f"ERROR")
+            out.append(get('message', 'Unknown error'))
+        
+        else:
+            out.append(f"RESULT (type: {result_type})")
+            out.append(_dump(result))
+        
+        out.append("-"*70)
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
 
 def interactive_mode(query_engine):
     """Run in interactive mode."""
@@ -111,9 +131,10 @@ def test_mode(query_engine):
         "help"
     ]
     
-    for i, query in enumerate(test_queries, 1):
+    results = query_engine.process_queries(test_queries)
+    
+    for i, (query, result) in enumerate(zip(test_queries, results), 1):
         print(f"\n[Test {i}/{len(test_queries)}] Query: '{query}'")
-        result = query_engine.process_query(query)
         print_result(result)
         
         input("\nPress Enter for next test...")
@@ -134,7 +155,7 @@ def main():
         # db.load_all() is not needed for SQL adapter, but let's check if we handle it or just skip
         # SQLJobDatabase doesn't have load_all()
         
-        total_jobs = len(db.get_all_jobs())
+        total_jobs = db.count_jobs()
         if total_jobs == 0:
             print("ERROR: No jobs loaded! Check your XML files.")
             sys.exit(1)
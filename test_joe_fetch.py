@@ -12,8 +12,7 @@ async def main():
     fetcher = JOEDataFetcher(db)
     
     # Get baseline count
-    existing_ids = db.get_existing_job_ids()
-    print(f"Existing jobs: {len(existing_ids)}")
+    print(f"Existing jobs: {db.count_jobs()}")
     
     # Run update
     result = await fetcher.run_daily_update()
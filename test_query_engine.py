@@ -1,22 +1,29 @@
 """Tests for query engine module."""
+import functools
+import os
 import pytest
 from pathlib import Path
 from database import SQLJobDatabase
-from query_engine import QueryEngine
+from query_engine import QueryEngine, YEAR_RE
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def database():
     """Fixture to load database once for all tests."""
     db = SQLJobDatabase('jobs.db')
     
-    if len(db.get_all_jobs()) == 0:
+    # The database is read-only during tests, so memoize the metadata accessors
+    # (shared by the tests and the query engine)
+    for name in ('get_all_jobs', 'get_years', 'get_institutions', 'get_countries'):
+        setattr(db, name, functools.lru_cache(maxsize=None)(getattr(db, name)))
+    
+    if db.count_jobs() == 0:
         pytest.skip("No jobs loaded from XML files")
     
     return db
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def query_engine(database):
     """Fixture to create query engine."""
     return QueryEngine(database)
@@ -55,24 +62,15 @@ def test_count_query_total(query_engine, database):
     
     assert result['type'] == 'count'
     assert 'count' in result
-    assert result['count'] == len(database.get_all_jobs())
+    assert result['count'] == database.count_jobs()
     
     print(f"Total jobs: {result['count']}")
 
 
 def test_count_query_by_institution(query_engine, database):
     """Test count queries filtered by institution."""
-    institutions = database.get_institutions()
-    if not institutions:
-        pytest.skip("No institutions available")
-    
     # Find an institution with jobs
-    test_inst = None
-    for inst in institutions:
-        if len(database.get_by_institution(inst)) > 0:
-            test_inst = inst
-            break
-    
+    test_inst = database.get_first_nonempty_institution()
     if not test_inst:
         pytest.skip("No suitable institution found")
     
@@ -167,19 +165,12 @@ def test_help_query(query_engine):
 def test_combined_filters(query_engine, database):
     """Test queries with combined filters."""
     years = database.get_years()
-    countries = database.get_countries()
-    
-    if not years or not countries:
+    if not years:
         pytest.skip("Insufficient data for combined filter test")
     
     test_year = years[0]
     # Find a country with jobs
-    test_country = None
-    for country in countries:
-        if len(database.get_by_country(country)) > 0:
-            test_country = country
-            break
-    
+    test_country = database.get_first_nonempty_country()
     if not test_country:
         pytest.skip("No suitable country found")
     
@@ -205,8 +196,6 @@ def test_empty_query(query_engine):
 
 def test_year_extraction():
     """Test year extraction from queries."""
-    import re
-    
     test_cases = [
         ("how many jobs in 2024", "2024"),
         ("jobs from 2023", "2023"),
@@ -214,12 +203,45 @@ def test_year_extraction():
     ]
     
     for query, expected_year in test_cases:
-        year_match = re.search(r'\b(19|20)\d{2}\b', query)
+        year_match = YEAR_RE.search(query)
         assert year_match is not None
         assert year_match.group(0) == expected_year
     
     print("Year extraction tests passed")
 
 
+
+def test_cached_result_keeps_last_sql(database):
+    """Test that a cache hit never restores SQL from a different query."""
+    qe = QueryEngine(database)
+    
+    for query in ("list jobs in 2024", "stats", "list jobs in 2023", "stats"):
+        qe.process_query(query)
+    
+    message = qe.process_query("show sql")['message']
+    assert "SELECT COUNT(*) FROM jobs" in message
+    assert "2024" not in message
+
+
+def test_cache_invalidated_when_database_changes(database, monkeypatch):
+    """Test that cached results are dropped once the database file is modified."""
+    qe = QueryEngine(database)
+    calls = []
+    original = qe._pattern_match_query
+    monkeypatch.setattr(qe, '_pattern_match_query', lambda query: calls.append(query) or original(query))
+    
+    qe.process_query("stats")
+    qe.process_query("stats")
+    assert len(calls) == 1
+    
+    stat = os.stat(database.db_path)
+    try:
+        os.utime(database.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        qe.process_query("stats")
+        assert len(calls) == 2
+    finally:
+        os.utime(database.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
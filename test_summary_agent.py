@@ -0,0 +1,239 @@
+"""Tests for summary agent module."""
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from config import Config
+from summary_agent import SummaryAgent
+
+
+@pytest.fixture
+def agent():
+    """Fixture to create a summary agent (no API calls are made)."""
+    return SummaryAgent()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", ""),
+    ("   ", ""),
+    ("There are 42 jobs in 2024.", "There are 42 jobs in 2024."),
+    ("  Harvard posted 3 jobs.  ", "Harvard posted 3 jobs."),
+    ("Summary: There are 42 jobs.", "There are 42 jobs."),
+    ("summary.  There are 42 jobs.", "There are 42 jobs."),
+    ("RESPONSE: Fine", "Fine"),
+    ("To answer. The data shows growth.", "The data shows growth."),
+    ("Result:", ""),
+    ("We need to query jobs. Now call ask_pete(x). There are 5 jobs.", "There are 5 jobs."),
+    ("Let me check. Answer: 42", "42"),
+    ("I will ask Pete. Iowa had 12 postings.", "Iowa had 12 postings."),
+    ("In 2024 there were 10 jobs.", "In 2024 there were 10 jobs."),
+    ("Answering briefly: 7", "Answering briefly: 7"),
+])
+def test_clean_response_text(agent, text, expected):
+    """Test removal of thinking-out-loud and prefix artifacts."""
+    assert agent._clean_response_text(text) == expected
+
+
+def test_clean_response_text_leaked_tool_calls(agent):
+    """Test that leaked JSON tool calls are replaced with a fallback."""
+    leaked_list = '[{"name": "create_chart", "parameters": {"chart_type": "bar"}}]'
+    leaked_single = '{"name": "ask_pete", "arguments": {"question": "x"}}'
+    
+    assert agent._clean_response_text(leaked_list) == "I've processed your request. The visualization has been created."
+    assert agent._clean_response_text(leaked_single) == "I've processed your request."
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None):
+    """Build a fake streaming chunk shaped like the OpenAI SDK's."""
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+def _tool_delta(index, call_id=None, name=None, arguments=None):
+    """Build a fake tool call fragment."""
+    return SimpleNamespace(index=index, id=call_id,
+                           function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def test_consume_stream_split_arguments(agent):
+    """Test that tool arguments split across chunks are reassembled before dispatch."""
+    stream = [
+        _chunk(tool_calls=[_tool_delta(0, "call_1", "ask_", '{"ques')]),
+        _chunk(tool_calls=[_tool_delta(0, name="pete", arguments='tion": "jobs in ')]),
+        _chunk(tool_calls=[_tool_delta(0, arguments='2024"}')]),
+        _chunk(finish_reason="tool_calls"),
+    ]
+    callbacks = {"ask_pete": lambda question: {"question": question}}
+    
+    content, calls, _ = agent._consume_stream(iter(stream), callbacks)
+    
+    assert content is None
+    assert [(c["id"], c["name"]) for c in calls] == [("call_1", "ask_pete")]
+    assert calls[0]["future"].result() == {"question": "jobs in 2024"}
+
+
+def test_consume_stream_multiple_calls_run_in_order(agent):
+    """Test that a stateful tool sees the effects of earlier calls in the same turn."""
+    state = {"sql": "OLD SQL"}
+    
+    def ask_pete(question):
+        time.sleep(0.05)
+        state["sql"] = "NEW SQL"
+        return {"data": []}
+    
+    stream = [
+        _chunk(tool_calls=[_tool_delta(0, "call_1", "ask_pete", '{"question": "count"}')]),
+        _chunk(tool_calls=[_tool_delta(1, "call_2", "get_last_sql", '{}')]),
+        _chunk(tool_calls=[_tool_delta(2, "call_3", "no_such_tool", '{}')]),
+        _chunk(finish_reason="tool_calls"),
+    ]
+    callbacks = {"ask_pete": ask_pete, "get_last_sql": lambda: {"sql": state["sql"]}}
+    
+    _, calls, _ = agent._consume_stream(iter(stream), callbacks)
+    
+    assert [c["name"] for c in calls] == ["ask_pete", "get_last_sql", "no_such_tool"]
+    assert calls[1]["future"].result() == {"sql": "NEW SQL"}
+    assert calls[2]["future"].result() == {"error": "Unknown tool: no_such_tool"}
+
+
+def test_consume_stream_independent_calls_run_in_parallel(agent):
+    """Test that calls not reading shared state run concurrently."""
+    barrier = threading.Barrier(2, timeout=2)
+    
+    def ask_pete(question):
+        barrier.wait()
+        return {"data": []}
+    
+    def create_chart(chart_type):
+        barrier.wait()
+        return {"chart_path": "/tmp/chart.png"}
+    
+    stream = [
+        _chunk(tool_calls=[_tool_delta(0, "call_1", "ask_pete", '{"question": "count"}')]),
+        _chunk(tool_calls=[_tool_delta(1, "call_2", "create_chart", '{"chart_type": "bar"}')]),
+        _chunk(finish_reason="tool_calls"),
+    ]
+    
+    _, calls, _ = agent._consume_stream(iter(stream), {"ask_pete": ask_pete, "create_chart": create_chart})
+    
+    assert calls[0]["future"].result() == {"data": []}
+    assert calls[1]["future"].result() == {"chart_path": "/tmp/chart.png"}
+
+
+def test_consume_stream_unparseable_arguments(agent):
+    """Test that arguments which never parse are dispatched as an empty argument set."""
+    stream = [
+        _chunk(content="Checking. "),
+        _chunk(tool_calls=[_tool_delta(0, "call_1", "get_last_sql", 'not json')]),
+        _chunk(finish_reason="tool_calls"),
+    ]
+    received = []
+    callbacks = {"get_last_sql": lambda **kwargs: received.append(kwargs) or {"sql": "SELECT 1"}}
+    
+    content, calls, _ = agent._consume_stream(iter(stream), callbacks)
+    
+    assert content == "Checking. "
+    assert calls[0]["future"].result() == {"sql": "SELECT 1"}
+    assert received == [{}]
+
+
+def test_consume_stream_truncated_call_dropped(agent):
+    """Test that a tool call cut off at max_tokens is dropped rather than run with empty arguments."""
+    stream = [
+        _chunk(tool_calls=[_tool_delta(0, "call_1", "ask_pete", '{"question": "how many jo')]),
+        _chunk(finish_reason="length"),
+    ]
+    received = []
+    callbacks = {"ask_pete": lambda **kwargs: received.append(kwargs)}
+    
+    _, calls, finish_reason = agent._consume_stream(iter(stream), callbacks)
+    
+    assert finish_reason == "length"
+    assert calls == []
+    assert received == []
+
+
+def test_truncated_planning_turn_retried_with_summary_budget(agent):
+    """Test that a planning turn hitting its token cap is retried with the summary budget."""
+    requested = []
+    streams = iter([
+        [_chunk(tool_calls=[_tool_delta(0, "call_1", "ask_pete", '{"quest')]), _chunk(finish_reason="length")],
+        [_chunk(tool_calls=[_tool_delta(0, "call_1", "ask_pete", '{"question": "count"}')]),
+         _chunk(finish_reason="tool_calls")],
+        [_chunk(content="There are 3 jobs."), _chunk(finish_reason="stop")],
+    ])
+    
+    def create(**kwargs):
+        requested.append(kwargs["max_tokens"])
+        return iter(next(streams))
+    
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    agent.enabled = True
+    tools = [{"type": "function", "function": {"name": "ask_pete"}}]
+    
+    result = agent.process_query_with_tools("how many jobs", tools, {"ask_pete": lambda question: {"row_count": 3}})
+    
+    assert result["content"] == "There are 3 jobs."
+    assert requested == [Config.PLANNING_MAX_TOKENS, Config.SUMMARY_MAX_TOKENS, Config.SUMMARY_MAX_TOKENS]
+
+
+def test_history_compression_keeps_pairs(agent):
+    """Test that compressing history never leaves an assistant reply without its user turn."""
+    def create(**kwargs):
+        if kwargs.get("stream"):
+            return iter([_chunk(content="Answer."), _chunk(finish_reason="stop")])
+        message = SimpleNamespace(content="Earlier turns.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    agent.enabled = True
+    
+    compressed = 0
+    for i in range(12):
+        agent.process_query_with_tools(f"question {i}", [], {}, conversation_id="chan")
+        pending = agent._compressions.get("chan")
+        if pending is not None:
+            pending.result()
+        
+        history = agent.conversations["chan"]
+        assert len(history) <= agent.max_history + 1
+        verbatim = history[1:] if history[0]["role"] == "system" else history
+        compressed += history[0]["role"] == "system"
+        assert [m["role"] for m in verbatim] == ["user", "assistant"] * (len(verbatim) // 2), i
+    
+    assert compressed
+
+
+def test_truncated_turn_keeps_completed_calls(agent):
+    """Test that a truncated turn with a completed call proceeds instead of re-running that call."""
+    requested = []
+    streams = iter([
+        [_chunk(tool_calls=[_tool_delta(0, "call_1", "create_chart", '{"chart_type": "bar"}')]),
+         _chunk(tool_calls=[_tool_delta(1, "call_2", "ask_pete", '{"quest')]),
+         _chunk(finish_reason="length")],
+        [_chunk(content="Here is the chart."), _chunk(finish_reason="stop")],
+    ])
+    
+    def create(**kwargs):
+        requested.append(kwargs["max_tokens"])
+        return iter(next(streams))
+    
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    agent.enabled = True
+    charts_made = []
+    callbacks = {
+        "create_chart": lambda chart_type: charts_made.append(chart_type) or {"chart_path": "/tmp/chart.png"},
+        "ask_pete": lambda question: {"row_count": 0},
+    }
+    tools = [{"type": "function", "function": {"name": name}} for name in callbacks]
+    
+    result = agent.process_query_with_tools("plot it", tools, callbacks)
+    
+    assert charts_made == ["bar"]
+    assert result["charts"] == ["/tmp/chart.png"]
+    assert result["content"] == "Here is the chart."
+    assert requested == [Config.PLANNING_MAX_TOKENS, Config.SUMMARY_MAX_TOKENS]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
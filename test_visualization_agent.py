@@ -0,0 +1,36 @@
+"""Tests for visualization agent module."""
+import pytest
+from visualization_agent import VisualizationAgent
+
+LONG_LABELS = [
+    "University of California, Los Angeles",
+    "Massachusetts Institute of Technology",
+    "London School of Economics and Political Science",
+    "Federal Reserve Bank of San Francisco",
+]
+
+
+@pytest.fixture(scope="module")
+def agent():
+    """Fixture to create a visualization agent (charts rendered in memory)."""
+    return VisualizationAgent()
+
+
+@pytest.mark.parametrize("chart_type, data", [
+    ("bar", {"labels": LONG_LABELS, "values": [40, 30, 20, 10]}),
+    ("line", {"labels": LONG_LABELS, "values": [40, 30, 20, 10]}),
+    ("comparison", {"categories": LONG_LABELS,
+                    "series": {"2023": [4, 3, 2, 1], "2024": [1, 2, 3, 4]}}),
+])
+def test_axis_labels_inside_canvas(agent, chart_type, data):
+    """Test that long rotated tick labels and the x-axis label are not clipped."""
+    result = agent.create_chart(chart_type, data, "Long labels", return_bytes=True)
+    assert result.get('success')
+
+    fig = agent._fig
+    renderer = agent._canvas.get_renderer()
+    ax = fig.axes[0]
+    for text in [*ax.get_xticklabels(), ax.xaxis.label, ax.title]:
+        extent = text.get_window_extent(renderer)
+        assert extent.x0 >= fig.bbox.x0 and extent.x1 <= fig.bbox.x1, text.get_text()
+        assert extent.y0 >= fig.bbox.y0 and extent.y1 <= fig.bbox.y1, text.get_text()
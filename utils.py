@@ -1,9 +1,38 @@
 """Utility functions for the Discord Job Board Bot."""
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 import discord
 from config import Config
 
+# Config values read on every embed, bound at module level (see refresh_config_cache)
+_EMBED_COLOR = Config.EMBED_COLOR
+_MAX_DISP = Config.MAX_RESULTS_DISPLAY
+
+# [monotonic time of last read, cached UTC datetime]
+_now_cache = [0.0, None]
+
+
+def refresh_config_cache():
+    """Re-read cached Config values after Config has been changed at runtime."""
+    global _EMBED_COLOR, _MAX_DISP
+    _EMBED_COLOR = Config.EMBED_COLOR
+    _MAX_DISP = Config.MAX_RESULTS_DISPLAY
+
+
+def _now_cached(ttl_ms: int = 200) -> datetime:
+    """
+    Return the current UTC time, reusing the last value within ttl_ms.
+    
+    Embeds built for the same response share one timestamp instead of each
+    reading the clock.
+    """
+    now = time.monotonic()
+    if _now_cache[1] is None or (now - _now_cache[0]) * 1000 > ttl_ms:
+        _now_cache[0] = now
+        _now_cache[1] = datetime.now(timezone.utc)
+    return _now_cache[1]
+
 
 def parse_date(date_str: str) -> datetime:
     """
@@ -18,8 +47,13 @@ def parse_date(date_str: str) -> datetime:
     if not date_str or not date_str.strip():
         return None
     
+    s = date_str.strip()
     try:
-        return datetime.strptime(date_str.strip(), '%Y-%m-%d %H:%M:%S')
+        # Fast path: slice the fixed-width fields instead of going through strptime
+        if len(s) == 19 and s[4] == '-' and s[7] == '-' and s[10] == ' ' and s[13] == ':' and s[16] == ':':
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]))
+        return datetime.strptime(s, '%Y-%m-%d %H:%M:%S')
     except ValueError:
         return None
 
@@ -33,7 +67,7 @@ def format_date(dt: datetime) -> str:
 
 def truncate_text(text: str, max_length: int = 1024) -> str:
     """
-    Truncate text to a maximum length, adding ellipsis if needed.
+    Truncate text to a maximum length, adding an ellipsis character if needed.
     
     Args:
         text: Text to truncate
@@ -42,9 +76,7 @@ def truncate_text(text: str, max_length: int = 1024) -> str:
     Returns:
         Truncated text
     """
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - 3] + "..."
+    return text if len(text) <= max_length else f"{text[:max_length - 1]}…"
 
 
 def create_embed(title: str, description: str = None, color: int = None) -> discord.Embed:
@@ -62,8 +94,8 @@ def create_embed(title: str, description: str = None, color: int = None) -> disc
     embed = discord.Embed(
         title=title,
         description=description,
-        color=color or Config.EMBED_COLOR,
-        timestamp=datetime.utcnow()
+        color=color or _EMBED_COLOR,
+        timestamp=_now_cached()
     )
     return embed
 
@@ -89,14 +121,14 @@ def create_results_embed(query: str, results: List[Dict[str, Any]], total_count:
     )
     
     # Add results as fields (limited to avoid embed size limits)
-    display_count = min(len(results), Config.MAX_RESULTS_DISPLAY)
+    display_count = min(len(results), _MAX_DISP)
     
     for i, result in enumerate(results[:display_count]):
         name = result.get('name', f'Result {i+1}')
-        value = result.get('value', 'No data')
+        value = str(result.get('value', 'No data'))
         embed.add_field(
-            name=truncate_text(name, 256),
-            value=truncate_text(str(value), 1024),
+            name=name if len(name) <= 256 else truncate_text(name, 256),
+            value=value if len(value) <= 1024 else truncate_text(value, 1024),
             inline=result.get('inline', False)
         )
     
@@ -120,7 +152,7 @@ def create_error_embed(error_message: str) -> discord.Embed:
         title="❌ Error",
         description=error_message,
         color=0xED4245,  # Discord red
-        timestamp=datetime.utcnow()
+        timestamp=_now_cached()
     )
     return embed
 
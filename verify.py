@@ -25,7 +25,7 @@ try:
     db_path = 'jobs.db'
     db = SQLJobDatabase(db_path)
     
-    total_jobs = len(db.get_all_jobs())
+    total_jobs = db.count_jobs()
     print(f"✓ Loaded {total_jobs} job postings")
     
     if total_jobs == 0:
@@ -39,9 +39,7 @@ except Exception as e:
 # Test 3: Test indexing
 print("\n[3/5] Testing database indexes...")
 try:
-    years = db.get_years()
-    institutions = db.get_institutions()
-    countries = db.get_countries()
+    years, institutions, countries = db.get_index_summary()
     
     print(f"✓ Indexed {len(years)} years: {', '.join(years)}")
     print(f"✓ Indexed {len(institutions)} institutions (sample: {', '.join(list(institutions)[:3])}...)")
@@ -84,8 +82,8 @@ try:
         "stats by country",
     ]
     
-    for query in test_queries:
-        result = qe.process_query(query)
+    # Queries are independent; run them concurrently and report in order
+    for query, result in zip(test_queries, qe.process_queries(test_queries, max_workers=3)):
         result_type = result.get('type', 'unknown')
         
         if result_type == 'count':
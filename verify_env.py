@@ -5,15 +5,14 @@ print("--- Loading .env ---")
 load_dotenv()
 
 print("\n--- Environment Variables Check ---")
-keys = [k for k in os.environ.keys() if 'OPENROUTER' in k.upper()]
+openrouter = {k: v for k, v in os.environ.items() if 'OPENROUTER' in k.upper()}
 
-if not keys:
+if not openrouter:
     print("❌ No OPENROUTER keys found in environment.")
 else:
-    for k in keys:
-        val = os.environ[k]
+    for k, val in openrouter.items():
         masked = val[:5] + "..." if len(val) > 5 else "EMPTY"
         print(f"✅ Found {k}: {masked}")
 
-target = os.getenv('OPENROUTER_API_KEY')
+target = openrouter.get('OPENROUTER_API_KEY')
 print(f"\nTarget 'OPENROUTER_API_KEY' loaded? : {bool(target)}")
@@ -2,32 +2,159 @@
 
 This tool generates temporary PNG visualizations that are deleted after use.
 """
+import gc
+import hashlib
 import logging
+import math
 import tempfile
 import os
+import queue
+import threading
+import time
+from itertools import cycle
 from typing import Dict, Any, List, Optional
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend for server use
+
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Path-unsafe characters mapped to '_' when deriving a filename from a chart title
+_FN_TABLE = str.maketrans({c: '_' for c in ' /\\:\n\r\t*?"<>|\0'})
+
+# Orphaned charts (callers that never reached cleanup_chart) are swept on this schedule
+SWEEP_INTERVAL_SECONDS = 300
+MAX_CHART_AGE_SECONDS = 900
+
+# One sweeper thread per temp dir, shared by every agent instance using it
+_sweepers: Dict[str, threading.Thread] = {}
+_sweepers_lock = threading.Lock()
+
+
+def _chart_temp_root() -> Path:
+    """Return /dev/shm when it is a writable tmpfs mount (charts never touch disk), else the system temp dir."""
+    try:
+        with open('/proc/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 2 and fields[1] == '/dev/shm' and fields[2] == 'tmpfs':
+                    if os.access('/dev/shm', os.W_OK):
+                        return Path('/dev/shm')
+                    break
+    except OSError:
+        pass
+    return Path(tempfile.gettempdir())
+
+
+def _evict_and_unlink(path):
+    """Unlink a chart file and drop its pages from the page cache."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.unlink(path)
+        # Drop the file's pages from the page cache rather than leaving them to age out
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _sweep(temp_dir: Path):
+    """Periodically delete charts in temp_dir older than MAX_CHART_AGE_SECONDS."""
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        cutoff = time.time() - MAX_CHART_AGE_SECONDS
+        try:
+            for path in temp_dir.iterdir():
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        _evict_and_unlink(path)
+                        logger.info(f"Swept orphaned chart: {path}")
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    # A lingering handle can block deletion; collect and retry next sweep
+                    logger.warning(f"Failed to sweep chart {path}: {e}")
+                    gc.collect()
+        except Exception as e:
+            logger.warning(f"Chart sweep failed: {e}")
+
+
+def _start_sweeper(temp_dir: Path):
+    """Start the sweeper thread for temp_dir unless one is already running."""
+    key = str(temp_dir)
+    with _sweepers_lock:
+        if key in _sweepers:
+            return
+        # The thread holds only the directory, never an agent, so agents can be freed
+        thread = threading.Thread(target=_sweep, args=(temp_dir,), name="chart-sweeper", daemon=True)
+        _sweepers[key] = thread
+        thread.start()
+
 
 class VisualizationAgent:
     """Generate temporary charts and graphs for job market data."""
     
-    def __init__(self):
-        """Initialize the Visualization Agent with temp directory."""
-        # Use system temp directory
-        self.temp_dir = Path(tempfile.gettempdir()) / 'joe_bot_charts'
+    # Series colors for comparison charts (Discord palette)
+    _SERIES_COLORS = ('#5865F2', '#ED4245', '#57F287', '#FEE75C')
+    # Pie wedge colors, filled in from the Set3 colormap when matplotlib is first loaded
+    _SET3_COLORS = None
+    # Pie charts have no tick labels, so fixed margins suffice; axis charts are laid out
+    # with tight_layout because rotated labels (institution names) vary widely in length
+    _PIE_MARGINS = {'left': 0.1, 'right': 0.9, 'top': 0.92, 'bottom': 0.05}
+    
+    def __init__(self, dpi: int = 100, pie_dpi: int = 150, fast_compress: bool = True,
+                 warm_fonts: bool = False):
+        """
+        Initialize the Visualization Agent with temp directory.
+        
+        Args:
+            dpi: Output resolution for bar, line and comparison charts
+            pie_dpi: Output resolution for pie charts (label text needs more pixels)
+            fast_compress: Encode PNGs at zlib level 1 (faster, slightly larger files)
+            warm_fonts: Load matplotlib and its font cache in a background thread now,
+                so the first chart renders warm (off by default to keep the import lazy)
+        """
+        self.dpi = dpi
+        self.pie_dpi = pie_dpi
+        self.fast_compress = fast_compress
+        # Use tmpfs when available, otherwise the system temp directory
+        self.temp_dir = _chart_temp_root() / 'joe_bot_charts'
         self.temp_dir.mkdir(exist_ok=True)
+        self._temp_dir_str = str(self.temp_dir) + os.sep
+        
+        # One figure/canvas reused for every chart (OO API, no pyplot figure registry),
+        # created on first use so matplotlib is only imported when a chart is requested
+        self._fig = None
+        self._canvas = None
+        # Reusable spooled buffers for in-memory renders (stay in RAM below 8MB)
+        self._buf_pool = queue.LifoQueue(maxsize=4)
+        # Figures are not thread-safe; tool calls may run concurrently
+        self._lock = threading.Lock()
+        
+        # chart_type -> single-chart renderer / axes-level drawer
+        self._dispatch = {
+            "bar": self._create_bar_chart,
+            "line": self._create_line_chart,
+            "pie": self._create_pie_chart,
+            "comparison": self._create_comparison_chart,
+        }
+        self._draw_dispatch = {
+            "bar": self._draw_bar,
+            "line": self._draw_line,
+            "pie": self._draw_pie,
+            "comparison": self._draw_comparison,
+        }
+        
+        _start_sweeper(self.temp_dir)
+        if warm_fonts:
+            threading.Thread(target=self._warm_fonts, name="chart-font-warmup", daemon=True).start()
         logger.info(f"VisualizationAgent initialized (temp dir: {self.temp_dir})")
     
     
     def create_chart(self, chart_type: str, data: Dict[str, Any], 
-                     title: str, filename: Optional[str] = None) -> Dict[str, Any]:
+                     title: str, filename: Optional[str] = None,
+                     return_bytes: bool = False, return_file: bool = False) -> Dict[str, Any]:
         """
         Create a temporary chart that will be deleted after use.
         
@@ -36,33 +163,58 @@ class VisualizationAgent:
             data: Data to visualize (format depends on chart type)
             title: Chart title
             filename: Optional custom filename (without extension)
+            return_bytes: Render to memory and return the PNG as 'chart_bytes'
+                instead of writing a file (nothing to clean up afterwards)
+            return_file: Render to an unnamed file and return it open as 'chart_file';
+                its storage is freed when the caller closes it (no cleanup_chart needed)
         
         Returns:
-            Dictionary with temporary chart path and metadata
+            Dictionary with temporary chart path (or bytes/file) and metadata
         """
+        create = self._dispatch.get(chart_type)
+        if create is None:
+            return {"error": f"Unknown chart type: {chart_type}"}
+        
+        buf = None
+        anon_file = None
         try:
-            if not filename:
-                # Generate filename from title
-                filename = title.lower().replace(' ', '_').replace('/', '_')[:50]
-            
-            # Create in temp directory
-            filepath = self.temp_dir / f"{filename}.png"
+            if return_bytes:
+                target = buf = self._acquire_buffer()
+            elif return_file:
+                fd = self._create_anon_fd()
+                if fd is not None:
+                    target = anon_file = os.fdopen(fd, 'w+b')
+                else:
+                    target = anon_file = tempfile.TemporaryFile(dir=self.temp_dir, suffix='.png')
+            else:
+                if not filename:
+                    filename = self._chart_filename(title)
+                
+                # Create in temp directory
+                target = f"{self._temp_dir_str}{filename}.png"
             
             logger.info(f"Creating temporary {chart_type} chart: {title}")
             
-            if chart_type == "bar":
-                result = self._create_bar_chart(data, title, filepath)
-            elif chart_type == "line":
-                result = self._create_line_chart(data, title, filepath)
-            elif chart_type == "pie":
-                result = self._create_pie_chart(data, title, filepath)
-            elif chart_type == "comparison":
-                result = self._create_comparison_chart(data, title, filepath)
-            else:
-                return {"error": f"Unknown chart type: {chart_type}"}
+            with self._lock:
+                self._ensure_figure()
+                result = create(data, title, target)
+            
+            if return_bytes:
+                if result.get('success'):
+                    buf.seek(0)
+                    result['chart_bytes'] = buf.read()
+                return result
+            
+            if return_file:
+                if result.get('success'):
+                    target.seek(0)
+                    result['chart_file'] = target
+                    anon_file = None  # Caller owns (and closes) it now
+                return result
             
             # Mark result as temporary
             if result.get('success'):
+                result['chart_path'] = target
                 result['temporary'] = True
                 result['note'] = 'Chart will be auto-deleted after use'
             
@@ -71,6 +223,86 @@ class VisualizationAgent:
         except Exception as e:
             logger.error(f"Error creating chart: {e}")
             return {"error": str(e)}
+        finally:
+            if buf is not None:
+                self._release_buffer(buf)
+            if anon_file is not None:
+                anon_file.close()
+    
+    def create_charts(self, specs: List[Dict[str, Any]], filename: Optional[str] = None,
+                      return_bytes: bool = False) -> Dict[str, Any]:
+        """
+        Draw several charts as subplots of a single PNG (two per row).
+        
+        Args:
+            specs: List of chart specs, each with 'chart_type', 'data' and 'title'
+            filename: Optional custom filename (without extension)
+            return_bytes: Render to memory and return the PNG as 'chart_bytes'
+        
+        Returns:
+            Dictionary with temporary chart path (or bytes) and per-chart results
+        """
+        if not specs:
+            return {"error": "No charts requested"}
+        
+        buf = None
+        try:
+            if return_bytes:
+                target = buf = self._acquire_buffer()
+            else:
+                if not filename:
+                    filename = self._chart_filename(' + '.join(spec.get('title', '') for spec in specs))
+                target = f"{self._temp_dir_str}{filename}.png"
+            
+            n = len(specs)
+            rows = math.ceil(n / 2)
+            cols = min(n, 2)
+            logger.info(f"Creating {n} charts in one {rows}x{cols} figure")
+            
+            with self._lock:
+                self._ensure_figure()
+                self._fig.clear()
+                self._fig.set_size_inches(12, 5 * rows)
+                
+                charts = []
+                for i, spec in enumerate(specs):
+                    ax = self._fig.add_subplot(rows, cols, i + 1)
+                    chart_type = spec.get('chart_type')
+                    draw = self._draw_dispatch.get(chart_type)
+                    if draw is None:
+                        chart = {"error": f"Unknown chart type: {chart_type}"}
+                    else:
+                        chart = draw(ax, spec.get('data', {}), spec.get('title', ''))
+                    if not chart.get('success'):
+                        ax.set_axis_off()
+                    charts.append(chart)
+                
+                if not any(chart.get('success') for chart in charts):
+                    return {"error": "No charts could be drawn", "charts": charts}
+                
+                self._fig.tight_layout()
+                self._save(target, self.dpi)
+            
+            result = {
+                "success": True,
+                "chart_type": "multi",
+                "charts": charts
+            }
+            if return_bytes:
+                buf.seek(0)
+                result['chart_bytes'] = buf.read()
+            else:
+                result['chart_path'] = target
+                result['temporary'] = True
+                result['note'] = 'Chart will be auto-deleted after use'
+            return result
+        
+        except Exception as e:
+            logger.error(f"Error creating charts: {e}")
+            return {"error": str(e)}
+        finally:
+            if buf is not None:
+                self._release_buffer(buf)
     
     def cleanup_chart(self, chart_path: str) -> bool:
         """
@@ -83,23 +315,158 @@ class VisualizationAgent:
             True if deleted successfully
         """
         try:
-            path = Path(chart_path)
-            if path.exists():
-                path.unlink()
-                logger.info(f"Deleted temporary chart: {chart_path}")
-                return True
+            _evict_and_unlink(chart_path)
+            logger.info(f"Deleted temporary chart: {chart_path}")
+            return True
+        except FileNotFoundError:
             return False
         except Exception as e:
             logger.warning(f"Failed to delete chart {chart_path}: {e}")
             return False
     
+    def _chart_filename(self, title: str) -> str:
+        """Derive a path-safe filename from a chart title, with a short hash so distinct titles never collide."""
+        digest = hashlib.blake2b(title.encode(), digest_size=6).hexdigest()
+        return f"{title.lower().translate(_FN_TABLE)[:50]}_{digest}"
+    
+    def _create_anon_fd(self) -> Optional[int]:
+        """
+        Open an unnamed file in temp_dir that the kernel frees on close.
+        
+        Returns:
+            File descriptor, or None if O_TMPFILE is unsupported here
+        """
+        if not hasattr(os, 'O_TMPFILE'):
+            return None
+        try:
+            return os.open(self._temp_dir_str, os.O_TMPFILE | os.O_RDWR, 0o600)
+        except OSError:
+            return None
+    
+    def _acquire_buffer(self):
+        """Take a render buffer from the pool, or create one if the pool is empty."""
+        try:
+            return self._buf_pool.get_nowait()
+        except queue.Empty:
+            return tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, suffix='.png')
+    
+    def _release_buffer(self, buf):
+        """Reset a render buffer and return it to the pool (closed if the pool is full)."""
+        buf.seek(0)
+        buf.truncate(0)
+        try:
+            self._buf_pool.put_nowait(buf)
+        except queue.Full:
+            buf.close()
+    
+    def _warm_fonts(self):
+        """Load matplotlib and its font cache off the request path so the first chart renders warm."""
+        try:
+            from matplotlib import font_manager
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            
+            font_manager.findfont('DejaVu Sans')
+            # Throwaway figure: the shared one is only touched under the render lock
+            fig = Figure()
+            canvas = FigureCanvasAgg(fig)
+            ax = fig.add_subplot(111)
+            ax.set_title('warmup', fontweight='bold')
+            ax.text(0, 0, 'warmup')
+            canvas.draw()
+        except Exception as e:
+            logger.warning(f"Font warm-up failed: {e}")
+    
+    def _ensure_figure(self):
+        """Import matplotlib and create the shared figure and canvas on first use."""
+        if self._fig is not None:
+            return
+        
+        import matplotlib
+        matplotlib.use('Agg')  # Non-interactive backend for server use
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        self._fig = Figure(figsize=(12, 6))
+        self._canvas = FigureCanvasAgg(self._fig)
+        
+        if VisualizationAgent._SET3_COLORS is None:
+            VisualizationAgent._SET3_COLORS = matplotlib.colormaps['Set3'].colors
+    
+    def _save(self, target, dpi: int, **kwargs):
+        """Render the shared figure as PNG to a file path or a binary buffer."""
+        # Charts are short-lived, so trade file size for encode speed. Tight bounding
+        # boxes need print_figure's cropping, so they keep the default encoder.
+        if self.fast_compress and not kwargs:
+            from PIL import Image
+            
+            self._fig.set_dpi(dpi)
+            self._canvas.draw()
+            img = Image.frombuffer('RGBA', self._canvas.get_width_height(),
+                                   self._canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+            img.save(target, format='PNG', compress_level=1, optimize=False, dpi=(dpi, dpi))
+            return
+        
+        self._canvas.print_figure(target, dpi=dpi, format='png', **kwargs)
+    
+    def _to_arrays(self, data: Dict[str, Any]):
+        """Convert chart labels and values to numpy arrays once, before drawing."""
+        labels = np.asarray(data.get('labels', []), dtype=object)
+        values = np.asarray(data.get('values', []), dtype=np.float64)
+        return labels, values
+    
+    def _new_axes(self, width: float, height: float, margins: Optional[Dict[str, float]] = None):
+        """Reset the shared figure to the given size (and optional fixed margins) and return a fresh axes."""
+        self._fig.clear()
+        self._fig.set_size_inches(width, height)
+        if margins:
+            self._fig.subplots_adjust(**margins)
+        return self._fig.add_subplot(111)
+    
     def _create_bar_chart(self, data: Dict[str, Any], title: str, 
-                         filepath: Path) -> Dict[str, Any]:
+                         target) -> Dict[str, Any]:
         """Create a bar chart."""
-        labels = data.get('labels', [])
-        values = data.get('values', [])
+        ax = self._new_axes(12, 6)
+        result = self._draw_bar(ax, data, title)
+        if result.get('success'):
+            self._fig.tight_layout()
+            self._save(target, self.dpi)
+        return result
+    
+    def _create_line_chart(self, data: Dict[str, Any], title: str, 
+                          target) -> Dict[str, Any]:
+        """Create a line chart for trends over time."""
+        ax = self._new_axes(12, 6)
+        result = self._draw_line(ax, data, title)
+        if result.get('success'):
+            self._fig.tight_layout()
+            self._save(target, self.dpi)
+        return result
+    
+    def _create_pie_chart(self, data: Dict[str, Any], title: str, 
+                         target) -> Dict[str, Any]:
+        """Create a pie chart for distribution."""
+        ax = self._new_axes(10, 8, self._PIE_MARGINS)
+        result = self._draw_pie(ax, data, title)
+        if result.get('success'):
+            self._save(target, self.pie_dpi, bbox_inches='tight')
+        return result
+    
+    def _create_comparison_chart(self, data: Dict[str, Any], title: str,
+                                target) -> Dict[str, Any]:
+        """Create a grouped bar chart for comparisons."""
+        ax = self._new_axes(12, 6)
+        result = self._draw_comparison(ax, data, title)
+        if result.get('success'):
+            self._fig.tight_layout()
+            self._save(target, self.dpi)
+        return result
+    
+    def _draw_bar(self, ax, data: Dict[str, Any], title: str) -> Dict[str, Any]:
+        """Draw a bar chart onto the given axes."""
+        labels, values = self._to_arrays(data)
         
-        if not labels or not values:
+        if not labels.size or not values.size:
             return {"error": "Missing labels or values for bar chart"}
         
         # Limit to top 15 for readability
@@ -107,43 +474,38 @@ class VisualizationAgent:
             labels = labels[:15]
             values = values[:15]
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        bars = ax.bar(range(len(labels)), values, color='#5865F2', alpha=0.8)
+        x = np.arange(len(labels))
+        bars = ax.bar(x, values, color='#5865F2', alpha=0.8)
         
         ax.set_xlabel(data.get('x_label', 'Category'), fontsize=12)
         ax.set_ylabel(data.get('y_label', 'Count'), fontsize=12)
         ax.set_title(title, fontsize=14, fontweight='bold')
-        ax.set_xticks(range(len(labels)))
+        ax.set_xticks(x)
         ax.set_xticklabels(labels, rotation=45, ha='right')
         ax.grid(axis='y', alpha=0.3)
         
         # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}', ha='center', va='bottom', fontsize=9)
-        
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=150, bbox_inches='tight')
-        plt.close()
+        ax.bar_label(bars, fmt='%d', padding=2, fontsize=9)
         
         return {
             "success": True,
-            "chart_path": str(filepath),
             "chart_type": "bar",
             "data_points": len(labels)
         }
     
-    def _create_line_chart(self, data: Dict[str, Any], title: str, 
-                          filepath: Path) -> Dict[str, Any]:
-        """Create a line chart for trends over time."""
-        labels = data.get('labels', [])
-        values = data.get('values', [])
+    def _draw_line(self, ax, data: Dict[str, Any], title: str) -> Dict[str, Any]:
+        """Draw a line chart for trends over time onto the given axes."""
+        labels, values = self._to_arrays(data)
         
-        if not labels or not values:
+        if not labels.size or not values.size:
             return {"error": "Missing labels or values for line chart"}
         
-        fig, ax = plt.subplots(figsize=(12, 6))
+        # Downsample long series to evenly spaced points, keeping the first and last
+        if len(values) > 50:
+            idx = np.linspace(0, len(values) - 1, 50).astype(int)
+            labels = labels[idx]
+            values = values[idx]
+        
         ax.plot(labels, values, marker='o', linewidth=2, 
                markersize=8, color='#5865F2')
         
@@ -152,44 +514,42 @@ class VisualizationAgent:
         ax.set_title(title, fontsize=14, fontweight='bold')
         ax.grid(True, alpha=0.3)
         
-        # Add value labels
-        for x, y in zip(labels, values):
-            ax.text(x, y, f'{int(y)}', ha='center', va='bottom', fontsize=9)
+        # Add value labels (skipped when there are too many points to read them)
+        if len(labels) <= 20:
+            for x, y in zip(labels, values):
+                ax.text(x, y, f'{int(y)}', ha='center', va='bottom', fontsize=9)
         
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=150, bbox_inches='tight')
-        plt.close()
+        ax.tick_params(axis='x', labelrotation=45)
+        for tick in ax.get_xticklabels():
+            tick.set_ha('right')
         
         return {
             "success": True,
-            "chart_path": str(filepath),
             "chart_type": "line",
             "data_points": len(labels)
         }
     
-    def _create_pie_chart(self, data: Dict[str, Any], title: str, 
-                         filepath: Path) -> Dict[str, Any]:
-        """Create a pie chart for distribution."""
-        labels = data.get('labels', [])
-        values = data.get('values', [])
+    def _draw_pie(self, ax, data: Dict[str, Any], title: str) -> Dict[str, Any]:
+        """Draw a pie chart for distribution onto the given axes."""
+        labels, values = self._to_arrays(data)
         
-        if not labels or not values:
+        if not labels.size or not values.size:
             return {"error": "Missing labels or values for pie chart"}
         
-        # Limit to top 10 for readability
-        if len(labels) > 10:
-            other_sum = sum(values[10:])
-            labels = labels[:10] + ['Others']
-            values = values[:10] + [other_sum]
+        # Limit to the 10 largest wedges for readability (input need not be sorted)
+        if len(values) > 10:
+            top_idx = np.argpartition(-values, 10)[:10]
+            top_idx = top_idx[np.argsort(-values[top_idx])]
+            other_sum = values.sum() - values[top_idx].sum()
+            labels = np.append(labels[top_idx], 'Others')
+            values = np.append(values[top_idx], other_sum)
         
-        fig, ax = plt.subplots(figsize=(10, 8))
         wedges, texts, autotexts = ax.pie(
             values, 
             labels=labels, 
             autopct='%1.1f%%',
             startangle=90,
-            colors=plt.cm.Set3.colors
+            colors=VisualizationAgent._SET3_COLORS
         )
         
         ax.set_title(title, fontsize=14, fontweight='bold')
@@ -202,42 +562,38 @@ class VisualizationAgent:
             autotext.set_fontweight('bold')
             autotext.set_fontsize(9)
         
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=150, bbox_inches='tight')
-        plt.close()
-        
         return {
             "success": True,
-            "chart_path": str(filepath),
             "chart_type": "pie",
             "data_points": len(labels)
         }
     
-    def _create_comparison_chart(self, data: Dict[str, Any], title: str,
-                                filepath: Path) -> Dict[str, Any]:
-        """Create a grouped bar chart for comparisons."""
+    def _draw_comparison(self, ax, data: Dict[str, Any], title: str) -> Dict[str, Any]:
+        """Draw a grouped bar chart for comparisons onto the given axes."""
         categories = data.get('categories', [])
         series_data = data.get('series', {})  # {series_name: [values]}
         
         if not categories or not series_data:
             return {"error": "Missing categories or series data"}
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        x = range(len(categories))
-        width = 0.8 / len(series_data)
-        colors = ['#5865F2', '#ED4245', '#57F287', '#FEE75C']
-        
-        for i, (series_name, values) in enumerate(series_data.items()):
-            offset = width * i - (width * len(series_data) / 2) + width/2
-            bars = ax.bar([xi + offset for xi in x], values, width, 
-                         label=series_name, color=colors[i % len(colors)], alpha=0.8)
+        # Limit to first 12 categories for readability
+        categories = categories[:12]
+        series_data = {name: np.asarray(values, dtype=np.float64)[:12]
+                       for name, values in series_data.items()}
+        
+        x = np.arange(len(categories))
+        n = len(series_data)
+        width = 0.8 / n
+        # Center each series' bars around the category tick
+        offsets = (np.arange(n) - (n - 1) / 2) * width
+        
+        for (series_name, values), offset, color in zip(series_data.items(), offsets,
+                                                         cycle(self._SERIES_COLORS)):
+            bars = ax.bar(x + offset, values, width, 
+                         label=series_name, color=color, alpha=0.8)
             
             # Add value labels
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}', ha='center', va='bottom', fontsize=8)
+            ax.bar_label(bars, fmt='%d', padding=1, fontsize=8)
         
         ax.set_xlabel('Category', fontsize=12)
         ax.set_ylabel(data.get('y_label', 'Count'), fontsize=12)
@@ -247,13 +603,8 @@ class VisualizationAgent:
         ax.legend()
         ax.grid(axis='y', alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=150, bbox_inches='tight')
-        plt.close()
-        
         return {
             "success": True,
-            "chart_path": str(filepath),
             "chart_type": "comparison",
             "series_count": len(series_data),
             "data_points": len(categories)